@@ -1,72 +1,150 @@
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import requests
-from datetime import datetime
-from statistics import mean
+from requests.adapters import HTTPAdapter
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
 from typing import Dict, List
-from collections import defaultdict
+import numpy as np
 from colorama import init, Fore, Style
-from tqdm import tqdm
+import heapq
 import time
 import sys
 
 # Initialize colorama for Windows compatibility
 init()
 
-def loading_animation(text):
+# Indexed by quality level; tuple indexing beats per-lookup dict hashing
+QUALITY_NAMES = ("Common", "Uncommon", "Special", "Rare", "Legendary", "Exclusive")
+QUALITY_COLORS = (Fore.WHITE, Fore.GREEN, Fore.BLUE, Fore.MAGENTA, Fore.YELLOW, Fore.RED)
+
+# Read-only default for items without 'additional'; avoids allocating a
+# fresh {} on every .get miss in the hot loop
+_EMPTY: dict = {}
+
+# Shared session: reuses the pooled connection across requests and
+# retries transient failures instead of dying on the first hiccup
+SESSION = requests.Session()
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip'
+})
+_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=3)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+def loading_animation(future, text):
+    # Spins only while the background request is in flight
     chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
-    for _ in range(10):
-        for char in chars:
-            sys.stdout.write(f'\r{Fore.CYAN}{char} {text}...{Style.RESET_ALL}')
-            sys.stdout.flush()
-            time.sleep(0.1)
+    for char in cycle(chars):
+        if future.done():
+            break
+        sys.stdout.write(f'\r{Fore.CYAN}{char} {text}...{Style.RESET_ALL}')
+        sys.stdout.flush()
+        time.sleep(0.1)
+
+def download_payload(url) -> bytes:
+    # stream=True avoids requests buffering its own copy of the body,
+    # keeping peak memory at ~1x the payload instead of 2x
+    with SESSION.get(url, stream=True) as response:
+        response.raise_for_status()
+        return response.raw.read(decode_content=True)
 
 def fetch_auction_data() -> dict:
     print(f"\n{Fore.CYAN}📊 STALCRAFT Market Analyzer{Style.RESET_ALL}")
     print("=" * 50)
-    
-    loading_animation("Fetching market data")
-    
+
     url = "http://xppai.io/stalcraft/a.json"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(download_payload, url)
+        loading_animation(future, "Fetching market data")
+        payload = future.result()
     print(f"\r{Fore.GREEN}✓ Data fetched successfully!{Style.RESET_ALL}")
-    return response.json()
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
 
 def format_price(price):
     return f"{price:,.0f}"
 
-def get_quality_name(qlt):
-    quality_names = {
-        0: "Common",
-        1: "Uncommon",
-        2: "Special",
-        3: "Rare",
-        4: "Legendary",
-        5: "Exclusive"
-    }
-    return quality_names.get(qlt, "Unknown")
+if njit is not None:
+    # Eager compilation with an explicit signature so the one-off JIT
+    # cost is paid at import time, not on the first call
+    @njit("Tuple((float64[:], int64[:], int64[:], int64[:]))(int64[:], int64[:], int64)",
+          cache=True)
+    def group_stats(qlt, price, nq):
+        sums = np.zeros(nq, np.float64)
+        counts = np.zeros(nq, np.int64)
+        mins = np.full(nq, 2**62, np.int64)
+        maxs = np.zeros(nq, np.int64)
+        for i in range(qlt.size):
+            q = qlt[i]
+            p = price[i]
+            sums[q] += p
+            counts[q] += 1
+            if p < mins[q]:
+                mins[q] = p
+            if p > maxs[q]:
+                maxs[q] = p
+        return sums, counts, mins, maxs
+else:
+    group_stats = None
 
 def analyze_and_display_prices(data: dict) -> dict:
-    print(f"\n{Fore.YELLOW}Processing {len(data['prices'])} market entries...{Style.RESET_ALL}")
+    # LOAD_FAST beats LOAD_ATTR in the f-string-heavy report below
+    CYAN = Fore.CYAN
+    GREEN = Fore.GREEN
+    RED = Fore.RED
+    BLUE = Fore.BLUE
+    YELLOW = Fore.YELLOW
+    WHITE = Fore.WHITE
+    RESET = Style.RESET_ALL
+
+    print(f"\n{YELLOW}Processing {len(data['prices'])} market entries...{RESET}")
     
-    # Group prices by quality
-    quality_prices = defaultdict(list)
+    # One pass to extract quality/price into parallel arrays,
+    # then vectorized reductions
+    qualities = []
+    prices = []
     skipped_count = 0
-    
-    for item in tqdm(data['prices'], desc="Analyzing prices", ncols=75):
-        additional = item.get('additional', {})
-        
+
+    for item in data['prices']:
+        additional = item.get('additional') or _EMPTY
+
         if 'bonus_properties' in additional:
             skipped_count += 1
             continue
-            
+
         qlt = additional.get('qlt')
         if qlt is not None:
-            quality_prices[qlt].append(item['price'])
-    
+            qualities.append(qlt)
+            prices.append(item['price'])
+
+    qlt_arr = np.asarray(qualities, dtype=np.int64)
+    price_arr = np.asarray(prices, dtype=np.int64)
+    if qlt_arr.size:
+        if group_stats is not None:
+            sums, counts, mins, maxs = group_stats(qlt_arr, price_arr, int(qlt_arr.max()) + 1)
+        else:
+            counts = np.bincount(qlt_arr)
+            sums = np.bincount(qlt_arr, weights=price_arr)
+            mins = np.full(counts.size, np.iinfo(np.int64).max, dtype=np.int64)
+            maxs = np.zeros(counts.size, dtype=np.int64)
+            np.minimum.at(mins, qlt_arr, price_arr)
+            np.maximum.at(maxs, qlt_arr, price_arr)
+    else:
+        counts = np.zeros(0, dtype=np.int64)
+        sums = mins = maxs = counts
+
+    print(f"{GREEN}✓ Analyzed {len(data['prices'])} entries{RESET}")
+
     # Prepare analysis results
     analysis_results = {
         "quality_analysis": {},
@@ -77,46 +155,41 @@ def analyze_and_display_prices(data: dict) -> dict:
         "recent_activity": []
     }
     
+    # Build the whole report in memory and emit it with one write,
+    # instead of one print (and potential flush) per line
+    out = []
+
     # Display and store analysis by quality
-    print(f"\n{Fore.CYAN}📈 Shard Price Analysis by Quality Level{Style.RESET_ALL}")
-    print("=" * 50)
-    
-    quality_colors = {
-        0: Fore.WHITE,    # Common
-        1: Fore.GREEN,    # Uncommon
-        2: Fore.BLUE,     # Special
-        3: Fore.MAGENTA,  # Rare
-        4: Fore.YELLOW,   # Legendary
-        5: Fore.RED       # Exclusive
-    }
-    
-    for qlt in sorted(quality_prices.keys()):
-        prices = quality_prices[qlt]
-        if not prices:
-            continue
-            
-        color = quality_colors.get(qlt, Fore.WHITE)
-        avg_price = mean(prices)
-        min_price = min(prices)
-        max_price = max(prices)
-        
+    out.append(f"\n{CYAN}📈 Shard Price Analysis by Quality Level{RESET}")
+    out.append("=" * 50)
+
+    for qlt in np.nonzero(counts)[0].tolist():
+        count = counts[qlt]
+        min_price = mins[qlt]
+        max_price = maxs[qlt]
+        avg_price = sums[qlt] / count
+
+        in_range = 0 <= qlt < len(QUALITY_NAMES)
+        quality_name = QUALITY_NAMES[qlt] if in_range else "Unknown"
+        color = QUALITY_COLORS[qlt] if in_range else WHITE
+
         # Display in console
-        print(f"\n{color}🏷️  {get_quality_name(qlt)} (Quality {qlt}):{Style.RESET_ALL}")
-        print(f"{'  └ Average Price:':<20} {Fore.GREEN}{format_price(avg_price)}₽{Style.RESET_ALL}")
-        print(f"{'  └ Minimum Price:':<20} {Fore.BLUE}{format_price(min_price)}₽{Style.RESET_ALL}")
-        print(f"{'  └ Maximum Price:':<20} {Fore.RED}{format_price(max_price)}₽{Style.RESET_ALL}")
-        print(f"{'  └ Number of items:':<20} {len(prices)}")
-        print(f"\n{'  💡 Buy Recommendations:'}")
-        print(f"{'  └ Standard:':<20} {Fore.YELLOW}{format_price(avg_price * 0.9)}₽{Style.RESET_ALL} (10% below avg)")
-        print(f"{'  └ Bargain:':<20} {Fore.GREEN}{format_price(min_price * 1.1)}₽{Style.RESET_ALL} (10% above min)")
+        out.append(f"\n{color}🏷️  {quality_name} (Quality {qlt}):{RESET}")
+        out.append(f"{'  └ Average Price:':<20} {GREEN}{format_price(avg_price)}₽{RESET}")
+        out.append(f"{'  └ Minimum Price:':<20} {BLUE}{format_price(min_price)}₽{RESET}")
+        out.append(f"{'  └ Maximum Price:':<20} {RED}{format_price(max_price)}₽{RESET}")
+        out.append(f"{'  └ Number of items:':<20} {count}")
+        out.append(f"\n{'  💡 Buy Recommendations:'}")
+        out.append(f"{'  └ Standard:':<20} {YELLOW}{format_price(avg_price * 0.9)}₽{RESET} (10% below avg)")
+        out.append(f"{'  └ Bargain:':<20} {GREEN}{format_price(min_price * 1.1)}₽{RESET} (10% above min)")
         
         # Store in results
-        analysis_results["quality_analysis"][get_quality_name(qlt)] = {
+        analysis_results["quality_analysis"][quality_name] = {
             "quality_level": qlt,
             "average_price": round(avg_price),
             "minimum_price": round(min_price),
             "maximum_price": round(max_price),
-            "item_count": len(prices),
+            "item_count": count,
             "buy_recommendations": {
                 "standard": round(avg_price * 0.9),
                 "bargain": round(min_price * 1.1)
@@ -124,43 +197,53 @@ def analyze_and_display_prices(data: dict) -> dict:
         }
     
     # Display and store market summary
-    print(f"\n{Fore.CYAN}📊 Market Summary{Style.RESET_ALL}")
-    print("=" * 50)
-    print(f"{'Total items analyzed:':<20} {len(data['prices'])}")
-    print(f"{'Items with bonus:':<20} {skipped_count}")
-    
+    out.append(f"\n{CYAN}📊 Market Summary{RESET}")
+    out.append("=" * 50)
+    out.append(f"{'Total items analyzed:':<20} {len(data['prices'])}")
+    out.append(f"{'Items with bonus:':<20} {skipped_count}")
+
     # Display and store recent activity
-    print(f"\n{Fore.CYAN}🕒 Recent Market Activity{Style.RESET_ALL}")
-    print("=" * 50)
-    recent_items = sorted(data['prices'], key=lambda x: x['time'], reverse=True)[:5]
+    out.append(f"\n{CYAN}🕒 Recent Market Activity{RESET}")
+    out.append("=" * 50)
+    # ISO-8601 timestamps sort lexicographically, so the raw string is a
+    # valid key; nlargest is O(N log 5) vs a full sort's O(N log N)
+    recent_items = heapq.nlargest(5, data['prices'], key=lambda x: x['time'])
     
     for item in recent_items:
-        additional = item.get('additional', {})
-        time = datetime.fromisoformat(item['time'].replace('Z', '+00:00'))
+        additional = item.get('additional') or _EMPTY
+        # '2024-01-01T12:34:56Z'[:19] is already '%Y-%m-%d %H:%M:%S'
+        # modulo the 'T'; no need to round-trip through datetime
+        time_text = item['time'][:19].replace('T', ' ')
         qlt = additional.get('qlt')
-        color = quality_colors.get(qlt, Fore.WHITE) if qlt else Fore.WHITE
-        
-        quality_name = get_quality_name(qlt) if qlt is not None else ""
+        in_range = qlt is not None and 0 <= qlt < len(QUALITY_NAMES)
+        color = QUALITY_COLORS[qlt] if in_range else WHITE
+
+        quality_name = QUALITY_NAMES[qlt] if in_range else ""
         quality_text = f"({quality_name})" if quality_name else ""
-        bonus_info = f"{Fore.YELLOW}[Has Bonus]{Style.RESET_ALL}" if 'bonus_properties' in additional else ""
-        
+        bonus_info = f"{YELLOW}[Has Bonus]{RESET}" if 'bonus_properties' in additional else ""
+
         # Display in console
-        print(f"{Fore.BLUE}{time.strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL} - "
-              f"{color}{format_price(item['price'])}₽{Style.RESET_ALL} {quality_text} {bonus_info}")
-        
+        out.append(f"{BLUE}{time_text}{RESET} - "
+                   f"{color}{format_price(item['price'])}₽{RESET} {quality_text} {bonus_info}")
+
         # Store in results
         analysis_results["recent_activity"].append({
             "time": item['time'],
             "price": item['price'],
-            "quality": get_quality_name(qlt) if qlt is not None else None,
+            "quality": quality_name if qlt is not None else None,
             "has_bonus": 'bonus_properties' in additional
         })
-    
+
+    sys.stdout.write("\n".join(out) + "\n")
     return analysis_results
 
 def export_to_json(analysis_results: dict, filename: str = "market_analysis.json") -> None:
-    with open(filename, 'w') as f:
-        json.dump(analysis_results, f, separators=(',', ':'))
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(analysis_results, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(analysis_results, f, separators=(',', ':'), default=int)
     print(f"\n{Fore.GREEN}✓ Analysis exported to {filename}{Style.RESET_ALL}")
 
 def main():